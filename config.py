@@ -12,14 +12,30 @@ FRAME_HEIGHT = 360  # Camera resolution height - ULTRA OPTIMIZED for smooth 30 F
 FPS_TARGET = 30  # Target frames per second
 SKIP_FRAMES = 1  # Process every Nth frame (1=all, 2=every other) for smoother FPS
 
+# Skip MediaPipe inference when consecutive frames are nearly identical
+# (static hand/scene). Compares 80x45 thumbnails with absdiff - costs
+# almost nothing, saves a full inference (~10-30ms) per static frame
+SKIP_STATIC_FRAMES = True
+MOTION_THRESHOLD = 40000  # Sum of absolute thumbnail differences (lower = stricter)
+
+# MediaPipe input size: frames larger than this are downscaled before
+# inference. The landmark model downsamples internally anyway, and its
+# output is normalized (0-1), so accuracy barely changes while the
+# preprocessing cost scales with input area
+INFERENCE_FRAME_WIDTH = 320
+INFERENCE_FRAME_HEIGHT = 240
+
 # ============================================================================
 # MEDIAPIPE HAND TRACKING SETTINGS - OPTIMIZED FOR PERFORMANCE
 # ============================================================================
 # Detection confidence: Higher = fewer false positives, lower = better detection
-DETECTION_CONFIDENCE = 0.6  # Range: 0.0-1.0 (recommended: 0.5-0.8) - REDUCED FOR SPEED
+DETECTION_CONFIDENCE = 0.5  # Range: 0.0-1.0 (recommended: 0.5-0.8) - REDUCED FOR SPEED
 
 # Tracking confidence: Higher = more stable tracking, lower = faster response
-TRACKING_CONFIDENCE = 0.5  # Range: 0.0-1.0 (recommended: 0.5-0.7)
+# Kept LOW on purpose: MediaPipe only re-runs its expensive palm
+# detector when tracking confidence drops below this, so a low value
+# keeps the cheap landmark tracker in charge frame-to-frame
+TRACKING_CONFIDENCE = 0.3  # Range: 0.0-1.0 (recommended: 0.3-0.5)
 
 # Model complexity: 0=lite (fast), 1=full (accurate)
 MODEL_COMPLEXITY = 0  # 0 or 1 (use 0 for low-end hardware) - SET TO LITE MODE
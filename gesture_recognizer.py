@@ -4,6 +4,7 @@ Classifies hand gestures from landmark data using geometric and temporal analysi
 Implements pinch, swipe, tap, and palm gestures with debouncing
 """
 
+import math
 import numpy as np
 import time
 from collections import deque
@@ -85,34 +86,44 @@ class GestureRecognizer:
         print(f"  - Debounce frames: {config.DEBOUNCE_FRAMES}")
         print(f"  - Gesture cooldown: {config.GESTURE_COOLDOWN}s")
     
-    def recognize(self, landmarks):
+    def recognize(self, landmarks, features=None):
         """
         Recognize gesture from current hand landmarks
-        
+
         Args:
             landmarks: numpy array (21, 3) of hand landmarks
-            
+            features: optional per-frame feature dict from
+                HandTracker (palm center, fingertip distances, hand
+                size). Falls back to the tracker's cached features so
+                each gesture predicate shares one norm computation.
+
         Returns:
             Gesture object or None
         """
         if landmarks is None:
             self._reset_temporal_state()
             return None
-        
+
+        if features is None:
+            features = self.hand_tracker.features
+
         # Check cooldown to prevent repeated detections
         if not self._check_cooldown():
             return None
-        
+
         # Update position history
-        palm_center = self.hand_tracker.get_palm_center()
+        if features is not None:
+            palm_center = features['palm']
+        else:
+            palm_center = self.hand_tracker.get_palm_center()
         if palm_center:
             self.position_history.append(palm_center)
-        
+
         # Try to detect each gesture type (in priority order)
         gesture = None
-        
+
         # 1. Pinch gesture (highest priority - precise control)
-        gesture = self._detect_pinch(landmarks)
+        gesture = self._detect_pinch(landmarks, features)
         if gesture:
             return self._debounce_gesture(gesture)
         
@@ -135,27 +146,32 @@ class GestureRecognizer:
         self.gesture_debounce_buffer.clear()
         return None
     
-    def _detect_pinch(self, landmarks):
+    def _detect_pinch(self, landmarks, features=None):
         """
         Detect pinch gesture based on thumb-index distance
-        
+
         Pinch In (Zoom Out): Distance decreases below threshold
         Pinch Out (Zoom In): Distance increases above threshold
-        
+
         Mathematical formula:
             distance = sqrt((x1-x2)² + (y1-y2)²)
-        
+
         Returns:
             Gesture or None
         """
         # Get thumb and index finger tip positions
-        thumb_tip = landmarks[self.hand_tracker.THUMB_TIP]
-        index_tip = landmarks[self.hand_tracker.INDEX_TIP]
-        
-        # Calculate 2D distance
-        distance = np.sqrt(
-            (thumb_tip[0] - index_tip[0])**2 + 
-            (thumb_tip[1] - index_tip[1])**2
+        if features is not None:
+            # Tips are already extracted in the shared feature array
+            thumb_tip = features['tips'][0]
+            index_tip = features['tips'][1]
+        else:
+            thumb_tip = landmarks[self.hand_tracker.THUMB_TIP]
+            index_tip = landmarks[self.hand_tracker.INDEX_TIP]
+
+        # Calculate 2D distance (scalar math - no numpy dispatch)
+        distance = math.hypot(
+            float(thumb_tip[0]) - float(index_tip[0]),
+            float(thumb_tip[1]) - float(index_tip[1])
         )
         
         # Add to history
@@ -5,6 +5,7 @@ Provides normalized 3D coordinates of 21 hand landmarks
 """
 
 import cv2
+import math
 import mediapipe as mp
 import numpy as np
 import time
@@ -55,10 +56,20 @@ class HandTracker:
         # Tracking state
         self.landmarks = None  # Current frame landmarks
         self.handedness = None  # Left or Right hand
+        self.features = None  # Per-frame derived features (shared by gesture predicates)
         self.frame_count = 0
         
         # Smoothing buffer for landmark positions
         self.landmark_history = deque(maxlen=config.SMOOTHING_WINDOW)
+
+        # Static-frame detection (skip inference when nothing moved)
+        self._prev_small = None
+        self._last_results = None
+
+        # Reusable inference buffers - allocated once on the first
+        # frame instead of fresh arrays per frame
+        self._rgb = None
+        self._small_bgr = None
         
         # FPS calculation
         self.fps = 0
@@ -87,48 +98,74 @@ class HandTracker:
                 - handedness: "Left" or "Right" or None
         """
         self.frame_count += 1
-        
-        # Convert BGR to RGB (MediaPipe uses RGB)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        
-        # Improve performance by marking frame as not writeable
-        rgb_frame.flags.writeable = False
-        
-        # Process frame with MediaPipe
-        results = self.hands.process(rgb_frame)
-        
-        # Make frame writeable again for drawing
-        rgb_frame.flags.writeable = True
+
+        if self._should_run_inference(frame):
+            # Downscale before inference when the camera frame is larger
+            # than the configured model input size - landmarks come back
+            # normalized, so they still map onto the full-size frame
+            src = frame
+            iw, ih = config.INFERENCE_FRAME_WIDTH, config.INFERENCE_FRAME_HEIGHT
+            if frame.shape[1] > iw or frame.shape[0] > ih:
+                if self._small_bgr is None or self._small_bgr.shape[:2] != (ih, iw):
+                    self._small_bgr = np.empty((ih, iw, 3), np.uint8)
+                cv2.resize(frame, (iw, ih), dst=self._small_bgr,
+                           interpolation=cv2.INTER_AREA)
+                src = self._small_bgr
+
+            # Convert BGR to RGB (MediaPipe uses RGB) into a persistent
+            # buffer so the conversion never allocates after frame one
+            if self._rgb is None or self._rgb.shape != src.shape:
+                self._rgb = np.empty_like(src)
+            self._rgb.flags.writeable = True
+            cv2.cvtColor(src, cv2.COLOR_BGR2RGB, dst=self._rgb)
+
+            # Improve performance by marking the buffer as not writeable
+            # so MediaPipe can pass it by reference instead of copying
+            self._rgb.flags.writeable = False
+
+            # Process frame with MediaPipe
+            results = self.hands.process(self._rgb)
+            self._last_results = results
+
+            # Reset detection status
+            self.hand_detected = False
+            self.landmarks = None
+            self.handedness = None
+            self.features = None
+
+            # Process detected hands
+            if results.multi_hand_landmarks:
+                # Get first detected hand (if multiple, use first)
+                hand_landmarks = results.multi_hand_landmarks[0]
+                hand_handedness = results.multi_handedness[0]
+
+                # Extract landmark coordinates
+                self.landmarks = self._extract_landmarks(hand_landmarks, frame.shape)
+                self.handedness = hand_handedness.classification[0].label
+                self.hand_detected = True
+
+                # Apply smoothing
+                if config.SMOOTHING_WINDOW > 1:
+                    self.landmarks = self._smooth_landmarks(self.landmarks)
+
+                # Compute shared features once so each gesture predicate
+                # doesn't redo the same norms/vector math
+                self.features = self._compute_features(self.landmarks)
+        # else: the scene is static - reuse last frame's landmarks as-is
+
         frame_copy = frame.copy()
-        
-        # Reset detection status
-        self.hand_detected = False
-        self.landmarks = None
-        self.handedness = None
-        
-        # Process detected hands
-        if results.multi_hand_landmarks:
-            # Get first detected hand (if multiple, use first)
-            hand_landmarks = results.multi_hand_landmarks[0]
-            hand_handedness = results.multi_handedness[0]
-            
-            # Extract landmark coordinates
-            self.landmarks = self._extract_landmarks(hand_landmarks, frame.shape)
-            self.handedness = hand_handedness.classification[0].label
-            self.hand_detected = True
-            
-            # Apply smoothing
-            if config.SMOOTHING_WINDOW > 1:
-                self.landmarks = self._smooth_landmarks(self.landmarks)
-            
+
+        if self.hand_detected:
             # Draw landmarks on frame
             if config.SHOW_LANDMARKS:
-                self._draw_landmarks(frame_copy, hand_landmarks)
-            
+                self._draw_landmarks(
+                    frame_copy, self._last_results.multi_hand_landmarks[0]
+                )
+
             # Draw bounding box
             if config.SHOW_BOUNDING_BOX:
                 self._draw_bounding_box(frame_copy, self.landmarks)
-        
+
         # Calculate and display FPS
         if config.SHOW_FPS:
             self._update_fps()
@@ -139,6 +176,36 @@ class HandTracker:
         
         return frame_copy, self.landmarks, self.handedness
     
+    def _should_run_inference(self, frame):
+        """
+        Decide whether MediaPipe needs to run on this frame
+
+        Webcams deliver near-duplicate frames when the scene is static.
+        A cheap absdiff on a small thumbnail detects this; when nothing
+        moved and a hand is already being tracked, inference is skipped
+        entirely and the previous landmarks are reused.
+
+        Args:
+            frame: BGR image from camera
+
+        Returns:
+            bool: True if hands.process should run
+        """
+        if not config.SKIP_STATIC_FRAMES:
+            return True
+
+        small = cv2.resize(frame, (80, 45))
+        prev_small = self._prev_small
+        self._prev_small = small
+
+        # Always run on the first frame and while no hand is tracked
+        # (a hand entering a static scene still changes the thumbnail)
+        if prev_small is None or not self.hand_detected:
+            return True
+
+        diff = int(cv2.absdiff(small, prev_small).sum())
+        return diff >= config.MOTION_THRESHOLD
+
     def _extract_landmarks(self, hand_landmarks, frame_shape):
         """
         Extract landmark coordinates and convert to pixel values
@@ -156,18 +223,64 @@ class HandTracker:
                 z normalized (smaller = closer to camera)
         """
         h, w, c = frame_shape
-        landmarks = []
-        
-        for landmark in hand_landmarks.landmark:
-            # Convert normalized coordinates to pixels
-            x = int(landmark.x * w)
-            y = int(landmark.y * h)
-            z = landmark.z  # Keep z normalized (depth)
-            
-            landmarks.append([x, y, z])
-        
-        return np.array(landmarks)
+
+        # Read the protobuf fields in one flat pass straight into a
+        # preshaped array, then scale x/y to pixels with a single
+        # vectorized multiply (instead of 21 Python-level conversions)
+        coords = np.fromiter(
+            (v for lm in hand_landmarks.landmark for v in (lm.x, lm.y, lm.z)),
+            dtype=np.float64,
+            count=63
+        ).reshape(21, 3)
+        coords[:, 0] *= w
+        coords[:, 1] *= h
+
+        return coords
     
+    def _compute_features(self, landmarks):
+        """
+        Compute per-frame features shared by all gesture predicates
+
+        Computing these once per frame means pinch, palm and swipe
+        detection can reuse the same values instead of each recomputing
+        norms and centers from the raw landmarks.
+
+        Args:
+            landmarks: numpy array (21, 3) of hand landmarks
+
+        Returns:
+            dict with keys:
+                'palm': (x, y, z) palm center
+                'tips': (5, 2) array of fingertip x/y positions
+                'tip_dists': (5,) distances from palm center to fingertips
+                'hand_size': wrist to middle-MCP distance (for normalization)
+        """
+        # Average of wrist and base knuckles (same set as get_palm_center)
+        palm_points = landmarks[[self.WRIST, self.INDEX_MCP, 5, 9, 13, 17]]
+        palm = np.mean(palm_points, axis=0)
+
+        # Fingertip positions (thumb, index, middle, ring, pinky)
+        tips = landmarks[[self.THUMB_TIP, self.INDEX_TIP, self.MIDDLE_TIP,
+                          self.RING_TIP, self.PINKY_TIP], :2]
+
+        # One vectorized norm covers all fingertip-to-palm distances
+        tip_dists = np.linalg.norm(tips - palm[:2], axis=1)
+
+        # Hand size for normalization (wrist to middle finger MCP)
+        wrist = landmarks[self.WRIST]
+        middle_mcp = landmarks[9]
+        hand_size = math.hypot(
+            float(wrist[0]) - float(middle_mcp[0]),
+            float(wrist[1]) - float(middle_mcp[1])
+        )
+
+        return {
+            'palm': tuple(palm),
+            'tips': tips,
+            'tip_dists': tip_dists,
+            'hand_size': hand_size
+        }
+
     def _smooth_landmarks(self, landmarks):
         """
         Apply moving average smoothing to reduce jitter
@@ -300,11 +413,10 @@ class HandTracker:
         
         p1 = self.landmarks[id1]
         p2 = self.landmarks[id2]
-        
+
         # 2D distance (x, y only)
-        distance = np.sqrt((p1[0] - p2[0])**2 + (p1[1] - p2[1])**2)
-        
-        return distance
+        # math.hypot is a direct C call - much faster than np.sqrt on scalars
+        return math.hypot(float(p1[0]) - float(p2[0]), float(p1[1]) - float(p2[1]))
     
     def get_palm_center(self):
         """
@@ -315,7 +427,11 @@ class HandTracker:
         """
         if self.landmarks is None:
             return None
-        
+
+        # Use the per-frame feature cache when available
+        if self.features is not None:
+            return self.features['palm']
+
         # Average of wrist and base knuckles
         palm_landmarks = [
             self.WRIST,
@@ -325,10 +441,10 @@ class HandTracker:
             13,  # Ring MCP
             17   # Pinky MCP
         ]
-        
+
         palm_points = self.landmarks[palm_landmarks]
         center = np.mean(palm_points, axis=0)
-        
+
         return tuple(center)
     
     def is_hand_open(self):
@@ -340,7 +456,15 @@ class HandTracker:
         """
         if self.landmarks is None:
             return False
-        
+
+        # Fast path: reuse the distances already computed this frame
+        if self.features is not None:
+            hand_size = self.features['hand_size']
+            if hand_size == 0:
+                return False
+            normalized_distance = self.features['tip_dists'].mean() / hand_size
+            return normalized_distance > config.PALM_OPEN_THRESHOLD
+
         # Check if fingertips are far from palm center
         palm_center = self.get_palm_center()
         if palm_center is None:
@@ -358,20 +482,20 @@ class HandTracker:
         distances = []
         for tip_id in fingertips:
             tip = self.landmarks[tip_id]
-            dist = np.sqrt(
-                (tip[0] - palm_center[0])**2 + 
-                (tip[1] - palm_center[1])**2
+            dist = math.hypot(
+                float(tip[0]) - palm_center[0],
+                float(tip[1]) - palm_center[1]
             )
             distances.append(dist)
-        
-        avg_distance = np.mean(distances)
-        
+
+        avg_distance = sum(distances) / len(distances)
+
         # Normalize by hand size (wrist to middle finger MCP distance)
         wrist = self.landmarks[self.WRIST]
         middle_mcp = self.landmarks[9]
-        hand_size = np.sqrt(
-            (wrist[0] - middle_mcp[0])**2 + 
-            (wrist[1] - middle_mcp[1])**2
+        hand_size = math.hypot(
+            float(wrist[0]) - float(middle_mcp[0]),
+            float(wrist[1]) - float(middle_mcp[1])
         )
         
         if hand_size == 0:
@@ -81,30 +81,41 @@ def test_camera():
         print(f"  ✗ Camera test failed: {e}")
         return False
 
-def test_mediapipe():
-    """Test MediaPipe hands"""
+def test_mediapipe(deep=False):
+    """Test MediaPipe hands
+
+    By default only verifies the Hands solution is importable - building
+    a real Hands object loads the TFLite models (~1-2s startup), which
+    is unnecessary just to confirm the installation. Pass --deep on the
+    command line to run a full model-load smoke test.
+    """
     print("\nTesting MediaPipe Hands...")
-    
+
     try:
         import mediapipe as mp
-        import cv2
-        import numpy as np
-        
-        mp_hands = mp.solutions.hands
-        hands = mp_hands.Hands(
-            static_image_mode=True,
-            max_num_hands=1,
-            min_detection_confidence=0.5
-        )
-        
-        # Create test image
-        test_image = np.zeros((480, 640, 3), dtype=np.uint8)
-        results = hands.process(test_image)
-        
-        hands.close()
+
+        # Cheap check: the solution class must be resolvable
+        _ = mp.solutions.hands.Hands
+
+        if deep:
+            import numpy as np
+
+            print("  (deep check: loading hand landmark models...)")
+            hands = mp.solutions.hands.Hands(
+                static_image_mode=True,
+                max_num_hands=1,
+                min_detection_confidence=0.5
+            )
+
+            # Create test image
+            test_image = np.zeros((480, 640, 3), dtype=np.uint8)
+            results = hands.process(test_image)
+
+            hands.close()
+
         print("  ✓ MediaPipe OK")
         return True
-    
+
     except Exception as e:
         print(f"  ✗ MediaPipe test failed: {e}")
         return False
@@ -126,16 +137,19 @@ def test_flask():
 def main():
     """Run all checks"""
     print_header("GESTURE EARTH CONTROL - QUICK START")
-    
+
     print("This script will verify your installation.\n")
-    
+
+    # --deep: also load the MediaPipe models (slower, more thorough)
+    deep = "--deep" in sys.argv
+
     all_ok = True
-    
+
     # Run checks
     all_ok &= check_python_version()
     all_ok &= check_dependencies()
     all_ok &= test_camera()
-    all_ok &= test_mediapipe()
+    all_ok &= test_mediapipe(deep=deep)
     all_ok &= test_flask()
     
     # Summary
@@ -3,9 +3,120 @@ Utility Functions
 Helper functions for mathematical calculations, smoothing, and data processing
 """
 
+import math
 import numpy as np
 import time
 from collections import deque
+from functools import lru_cache
+
+# Numba is optional: when installed, the 3D transform kernel below is
+# JIT-compiled to native code; otherwise a vectorized NumPy fallback
+# is used (see requirements.txt)
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# SciPy is optional too: exponential_smoothing uses its C-implemented
+# IIR filter when present, otherwise a Python loop (see requirements.txt)
+try:
+    from scipy.signal import lfilter
+    SCIPY_AVAILABLE = True
+except ImportError:
+    SCIPY_AVAILABLE = False
+
+
+@lru_cache(maxsize=4096)
+def rotation_matrix(rx10, ry10, rz10):
+    """
+    Fused X->Y->Z rotation matrix for angles quantized to 0.1 degree
+
+    Shared by both cube renderers (one cache instead of two): angles
+    only change in fixed gesture/autorotate steps, so steady-state
+    frames reuse a cached matrix instead of redoing six trig calls and
+    three 3x3 allocations.
+
+    Args:
+        rx10, ry10, rz10: angles in deci-degrees (int, 0-3599)
+
+    Returns:
+        numpy array: (3, 3) float32 rotation matrix (read-only)
+    """
+    cx, sx = math.cos(math.radians(rx10 / 10.0)), math.sin(math.radians(rx10 / 10.0))
+    cy, sy = math.cos(math.radians(ry10 / 10.0)), math.sin(math.radians(ry10 / 10.0))
+    cz, sz = math.cos(math.radians(rz10 / 10.0)), math.sin(math.radians(rz10 / 10.0))
+
+    rotation = (
+        np.array([[cz, -sz, 0], [sz, cz, 0], [0, 0, 1]], dtype=np.float32)
+        @ np.array([[cy, 0, sy], [0, 1, 0], [-sy, 0, cy]], dtype=np.float32)
+        @ np.array([[1, 0, 0], [0, cx, -sx], [0, sx, cx]], dtype=np.float32)
+    )
+    rotation.flags.writeable = False  # Cached - never mutate
+    return rotation
+
+
+def quantize_angle(angle):
+    """Quantize an angle in degrees to the rotation cache key (deci-degrees)"""
+    return int(round(angle * 10)) % 3600
+
+
+def _rotate_project_loop(vertices, rotation, zoom, scale,
+                         center_x, center_y, points, depths):
+    """Loop kernel for rotate_project (compiled by Numba when available)"""
+    for i in range(vertices.shape[0]):
+        x = vertices[i, 0]
+        y = vertices[i, 1]
+        z = vertices[i, 2]
+        rx = (rotation[0, 0] * x + rotation[0, 1] * y + rotation[0, 2] * z) * zoom
+        ry = (rotation[1, 0] * x + rotation[1, 1] * y + rotation[1, 2] * z) * zoom
+        rz = (rotation[2, 0] * x + rotation[2, 1] * y + rotation[2, 2] * z) * zoom
+        factor = 200.0 / (200.0 + rz)
+        points[i, 0] = int(rx * factor * scale + center_x)
+        points[i, 1] = int(ry * factor * scale + center_y)
+        depths[i] = rz
+
+
+if NUMBA_AVAILABLE:
+    _rotate_project_loop = njit(cache=True, fastmath=True)(_rotate_project_loop)
+
+
+def rotate_project(vertices, rotation, zoom, scale, center_x, center_y):
+    """
+    Rotate, zoom and perspective-project 3D vertices to 2D pixels
+
+    Fuses the whole per-frame vertex pipeline (rotation matmul, zoom,
+    perspective divide, screen offset, int cast) into one pass with no
+    intermediate arrays. With Numba installed this runs as a single
+    compiled kernel.
+
+    Args:
+        vertices: (N, 3) array of 3D points
+        rotation: (3, 3) rotation matrix
+        zoom, scale: scalar multipliers
+        center_x, center_y: screen-space center offsets in pixels
+
+    Returns:
+        tuple: (points, depths)
+            points: (N, 2) int32 pixel coordinates
+            depths: (N,) rotated z values (for depth sorting)
+    """
+    n = vertices.shape[0]
+    points = np.empty((n, 2), dtype=np.int32)
+    depths = np.empty(n, dtype=np.float64)
+
+    if NUMBA_AVAILABLE:
+        _rotate_project_loop(vertices, rotation, float(zoom), float(scale),
+                             float(center_x), float(center_y), points, depths)
+    else:
+        # Vectorized fallback (the pure-Python loop would be slower)
+        rotated = vertices @ rotation.T * zoom
+        depths[:] = rotated[:, 2]
+        factor = 200.0 / (200.0 + depths)
+        points[:, 0] = rotated[:, 0] * factor * scale + center_x
+        points[:, 1] = rotated[:, 1] * factor * scale + center_y
+
+    return points, depths
 
 
 def euclidean_distance(point1, point2):
@@ -19,9 +130,17 @@ def euclidean_distance(point1, point2):
     Returns:
         float: Distance
     """
-    p1 = np.array(point1)
-    p2 = np.array(point2)
-    return np.linalg.norm(p1 - p2)
+    # Scalar math beats np.linalg.norm here: building two ndarrays from
+    # tuples costs far more than the arithmetic for 2-3 components
+    if len(point1) == 2:
+        return math.hypot(point1[0] - point2[0], point1[1] - point2[1])
+    if len(point1) == 3:
+        return math.sqrt(
+            (point1[0] - point2[0]) ** 2 +
+            (point1[1] - point2[1]) ** 2 +
+            (point1[2] - point2[2]) ** 2
+        )
+    return math.sqrt(sum((a - b) ** 2 for a, b in zip(point1, point2)))
 
 
 def angle_between_vectors(v1, v2):
@@ -60,11 +179,15 @@ def moving_average(data, window_size=5):
     Returns:
         numpy array: Smoothed data
     """
-    if len(data) < window_size:
-        return np.array(data)
-    
-    weights = np.ones(window_size) / window_size
-    return np.convolve(data, weights, mode='valid')
+    arr = np.asarray(data, dtype=np.float64)
+    if len(arr) < window_size:
+        return arr.copy()
+
+    # Equal-weight rolling mean via cumulative-sum differences: O(N)
+    # instead of the O(N*W) generic convolution kernel
+    csum = np.cumsum(arr)
+    csum[window_size:] = csum[window_size:] - csum[:-window_size]
+    return csum[window_size - 1:] / window_size
 
 
 def exponential_smoothing(data, alpha=0.3):
@@ -78,12 +201,21 @@ def exponential_smoothing(data, alpha=0.3):
     Returns:
         numpy array: Smoothed data
     """
+    if SCIPY_AVAILABLE:
+        # Exponential smoothing is a first-order IIR filter; lfilter
+        # runs the whole scan in C. The initial condition makes the
+        # first output exactly data[0], matching the loop below
+        arr = np.asarray(data, dtype=np.float64)
+        smoothed, _ = lfilter([alpha], [1.0, -(1.0 - alpha)], arr,
+                              zi=[(1.0 - alpha) * arr[0]])
+        return smoothed
+
     smoothed = [data[0]]
-    
+
     for i in range(1, len(data)):
         smoothed_value = alpha * data[i] + (1 - alpha) * smoothed[-1]
         smoothed.append(smoothed_value)
-    
+
     return np.array(smoothed)
 
 
@@ -228,21 +360,57 @@ def detect_finger_extended(landmarks, finger_id):
     return tip_dist > pip_dist * 1.1
 
 
+# Tip/PIP landmark indices per finger (thumb, index, middle, ring, pinky)
+_FINGER_TIPS = np.array([4, 8, 12, 16, 20], dtype=np.intp)
+_FINGER_PIPS = np.array([2, 6, 10, 14, 18], dtype=np.intp)
+
+
+def _count_extended_loop(lm, tips, pips):
+    """Loop kernel for count_extended_fingers (compiled by Numba when available)
+
+    Compares squared distances, so tip > pip * 1.1 becomes * 1.21
+    """
+    count = 0
+    for i in range(5):
+        tip_sq = 0.0
+        pip_sq = 0.0
+        for j in range(lm.shape[1]):
+            dt = lm[tips[i], j] - lm[0, j]
+            dp = lm[pips[i], j] - lm[0, j]
+            tip_sq += dt * dt
+            pip_sq += dp * dp
+        if tip_sq > pip_sq * 1.21:
+            count += 1
+    return count
+
+
+if NUMBA_AVAILABLE:
+    _count_extended_loop = njit(cache=True, fastmath=True)(_count_extended_loop)
+
+
 def count_extended_fingers(landmarks):
     """
     Count number of extended fingers
-    
+
     Args:
         landmarks: Hand landmarks
-        
+
     Returns:
         int: Number of extended fingers (0-5)
     """
-    count = 0
-    for finger_id in range(1, 6):
-        if detect_finger_extended(landmarks, finger_id):
-            count += 1
-    return count
+    if landmarks is None:
+        return 0
+
+    # One batched pass over the landmark array instead of five
+    # detect_finger_extended calls (ten distance computations)
+    lm = np.asarray(landmarks, dtype=np.float64)
+
+    if NUMBA_AVAILABLE:
+        return int(_count_extended_loop(lm, _FINGER_TIPS, _FINGER_PIPS))
+
+    tip_dists = np.linalg.norm(lm[_FINGER_TIPS] - lm[0], axis=1)
+    pip_dists = np.linalg.norm(lm[_FINGER_PIPS] - lm[0], axis=1)
+    return int((tip_dists > pip_dists * 1.1).sum())
 
 
 class FPSCounter: